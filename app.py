@@ -10,17 +10,31 @@ Development Approach: Specs-Driven Development (SDD) with Claude Code
 """
 
 import gradio as gr
+import atexit
+import bisect
 import json
+import mmap
 import os
+from contextlib import nullcontext
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 # =============================================================================
 # DATA MODEL
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a single to-do task."""
     id: int
@@ -30,13 +44,44 @@ class Task:
     created_at: str
     completed: bool = False
 
+    def to_dict(self) -> dict:
+        """Convert the task to a plain dict for JSON storage."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "category": self.category,
+            "created_at": self.created_at,
+            "completed": self.completed
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        """Rebuild a task from stored JSON without going through __init__."""
+        task = object.__new__(cls)
+        task.id = data["id"]
+        task.title = data["title"]
+        task.description = data["description"]
+        task.category = data["category"]
+        task.created_at = data["created_at"]
+        task.completed = data.get("completed", False)
+        return task
+
 
 # =============================================================================
 # CONSTANTS
 # =============================================================================
 
 CATEGORIES = ["Work", "Personal", "Shopping", "Health", "Other"]
+CATEGORIES_SET = frozenset(CATEGORIES)
+FILTER_CHOICES = ("All", *CATEGORIES)
 DATA_FILE = "tasks.json"
+STATUS_LABELS = ("[    ]", "[DONE]")  # indexed by Task.completed
+TASK_TEMPLATE = (
+    "{status} #{id} | {title}\n"
+    "        Category: {category} | Created: {created_at}\n"
+    "        Description: {description}"
+)
 
 
 # =============================================================================
@@ -47,104 +92,193 @@ class TodoApp:
     """Main application class for managing to-do tasks."""
 
     def __init__(self):
-        self.tasks: List[Task] = []
         self.next_id: int = 1
+        # Tasks keyed by ID; insertion order is ID order since IDs only grow
+        self._by_id: Dict[int, Task] = {}
+        self._by_category: Dict[str, List[Task]] = {}
+        self._dirty: bool = False
+        self._display_cache: Dict[str, str] = {}
+        self._task_lines: Dict[int, str] = {}
         self.load_from_file()
 
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks, ordered by ID."""
+        return list(self._by_id.values())
+
     def save_to_file(self) -> None:
-        """Save all tasks to JSON file."""
+        """Save all tasks to JSON file, replacing it atomically."""
         data = {
             "next_id": self.next_id,
-            "tasks": [asdict(task) for task in self.tasks]
+            "tasks": [task.to_dict() for task in self._by_id.values()]
         }
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(data)
+        else:
+            payload = json.dumps(data, separators=(",", ":")).encode()
+
+        tmp_file = DATA_FILE + ".tmp"
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        # The lock only keeps concurrent processes off the shared temp file.
+        # Each process still writes its own in-memory tasks, so the last
+        # writer wins; closing the lock file releases the lock.
+        lock_file = open(DATA_FILE + ".lock", "a") if fcntl is not None else nullcontext()
+        with lock_file as lock:
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            fd = os.open(tmp_file, flags, 0o644)
+            try:
+                written = 0
+                while written < len(payload):
+                    written += os.write(fd, payload[written:])
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, DATA_FILE)
+
+    def flush(self) -> None:
+        """Write pending changes to the JSON file, if there are any."""
+        if self._dirty:
+            self.save_to_file()
+            self._dirty = False
+
+    def _mark_dirty(self) -> None:
+        """Record that tasks changed and need to be written out."""
+        self._dirty = True
+        self._display_cache.clear()
 
     def load_from_file(self) -> None:
         """Load tasks from JSON file if it exists."""
+        tasks: List[Task] = []
         if os.path.exists(DATA_FILE):
             try:
-                with open(DATA_FILE, "r") as f:
-                    data = json.load(f)
-                    self.next_id = data.get("next_id", 1)
-                    self.tasks = [Task(**task) for task in data.get("tasks", [])]
-            except (json.JSONDecodeError, KeyError):
-                self.tasks = []
+                with (
+                    open(DATA_FILE, "rb") as f,
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+                ):
+                    if orjson is not None:
+                        with memoryview(mm) as view:
+                            data = orjson.loads(view)
+                    else:
+                        data = json.loads(mm[:])
+                self.next_id = data.get("next_id", 1)
+                tasks = [Task.from_dict(task) for task in data.get("tasks", [])]
+            # JSONDecodeError is a ValueError, as is mmap's error on an empty file
+            except (ValueError, KeyError):
+                tasks = []
                 self.next_id = 1
+        # Index in ID order even if the file was written in some other order
+        tasks.sort(key=lambda t: t.id)
+        self._by_id = {task.id: task for task in tasks}
+        self._by_category = {}
+        for task in tasks:
+            self._by_category.setdefault(task.category, []).append(task)
+        self._task_lines = {task.id: self._render_task(task) for task in tasks}
 
     def add_task(self, title: str, description: str, category: str) -> str:
         """Add a new task to the list."""
         if not title.strip():
             return "Error: Title cannot be empty!"
+        if category not in CATEGORIES_SET:
+            return f"Error: Unknown category '{category}'!"
 
         task = Task(
             id=self.next_id,
             title=title.strip(),
             description=description.strip(),
             category=category,
-            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            created_at=datetime.now().isoformat(sep=" ", timespec="seconds"),
             completed=False
         )
-        self.tasks.append(task)
+        self._by_id[task.id] = task
+        self._by_category.setdefault(task.category, []).append(task)
+        self._task_lines[task.id] = self._render_task(task)
         self.next_id += 1
-        self.save_to_file()
+        self._mark_dirty()
         return f"Task #{task.id} '{task.title}' added successfully!"
 
     def get_tasks_display(self, filter_category: str = "All") -> str:
-        """Get formatted display of tasks."""
-        tasks = self.tasks
-        if filter_category != "All":
-            tasks = [t for t in tasks if t.category == filter_category]
+        """Get formatted display of tasks, cached per filter until the next change."""
+        display = self._display_cache.get(filter_category)
+        if display is not None:
+            return display
 
-        if not tasks:
-            return "No tasks found."
+        if filter_category == "All":
+            tasks = self._by_id.values()
+        else:
+            tasks = self._by_category.get(filter_category)
 
-        output = []
-        for task in tasks:
-            status = "[DONE]" if task.completed else "[    ]"
-            output.append(
-                f"{status} #{task.id} | {task.title}\n"
-                f"        Category: {task.category} | Created: {task.created_at}\n"
-                f"        Description: {task.description or 'No description'}"
-            )
-        return "\n\n".join(output)
+        if not tasks:
+            display = "No tasks found."
+        else:
+            lines = self._task_lines
+            display = "\n\n".join(lines[task.id] for task in tasks)
+        self._display_cache[filter_category] = display
+        return display
 
     def update_task(self, task_id: int, title: str, description: str, category: str) -> str:
         """Update an existing task."""
-        for task in self.tasks:
-            if task.id == task_id:
-                if title.strip():
-                    task.title = title.strip()
-                if description.strip():
-                    task.description = description.strip()
-                if category:
-                    task.category = category
-                self.save_to_file()
-                return f"Task #{task_id} updated successfully!"
-        return f"Error: Task #{task_id} not found!"
+        task = self._by_id.get(task_id)
+        if task is None:
+            return f"Error: Task #{task_id} not found!"
+        if category and category not in CATEGORIES_SET:
+            return f"Error: Unknown category '{category}'!"
+        if title.strip():
+            task.title = title.strip()
+        if description.strip():
+            task.description = description.strip()
+        if category:
+            self._set_category(task, category)
+        self._task_lines[task_id] = self._render_task(task)
+        self._mark_dirty()
+        return f"Task #{task_id} updated successfully!"
 
     def delete_task(self, task_id: int) -> str:
         """Delete a task by ID."""
-        for task in self.tasks:
-            if task.id == task_id:
-                self.tasks.remove(task)
-                self.save_to_file()
-                return f"Task #{task_id} deleted successfully!"
-        return f"Error: Task #{task_id} not found!"
+        task = self._by_id.pop(task_id, None)
+        if task is None:
+            return f"Error: Task #{task_id} not found!"
+        self._by_category[task.category].remove(task)
+        del self._task_lines[task_id]
+        self._mark_dirty()
+        return f"Task #{task_id} deleted successfully!"
 
     def toggle_complete(self, task_id: int) -> str:
         """Toggle task completion status."""
-        for task in self.tasks:
-            if task.id == task_id:
-                task.completed = not task.completed
-                status = "completed" if task.completed else "incomplete"
-                self.save_to_file()
-                return f"Task #{task_id} marked as {status}!"
-        return f"Error: Task #{task_id} not found!"
+        task = self._by_id.get(task_id)
+        if task is None:
+            return f"Error: Task #{task_id} not found!"
+        task.completed = not task.completed
+        self._task_lines[task_id] = self._render_task(task)
+        status = "completed" if task.completed else "incomplete"
+        self._mark_dirty()
+        return f"Task #{task_id} marked as {status}!"
+
+    def has_task(self, task_id: int) -> bool:
+        """Check whether a task with the given ID exists."""
+        return task_id in self._by_id
 
     def get_task_ids(self) -> List[int]:
         """Get list of all task IDs."""
-        return [task.id for task in self.tasks]
+        return list(self._by_id)
+
+    @staticmethod
+    def _render_task(task: Task) -> str:
+        """Format a single task for the task list display."""
+        fields = task.to_dict()
+        fields["status"] = STATUS_LABELS[task.completed]
+        fields["description"] = task.description or "No description"
+        return TASK_TEMPLATE.format_map(fields)
+
+    def _set_category(self, task: Task, category: str) -> None:
+        """Change a task's category, keeping the category index in id order."""
+        if category == task.category:
+            return
+        # insort relies on every bucket already being sorted by id, which
+        # load_from_file and add_task guarantee
+        self._by_category[task.category].remove(task)
+        task.category = category
+        bisect.insort(self._by_category.setdefault(category, []), task, key=lambda t: t.id)
 
 
 # =============================================================================
@@ -153,10 +287,12 @@ class TodoApp:
 
 # Initialize the app
 app = TodoApp()
+atexit.register(app.flush)
 
 
 def add_task(title, description, category):
     result = app.add_task(title, description, category)
+    app.flush()
     tasks_display = app.get_tasks_display()
     return result, tasks_display, "", ""  # Clear inputs
 
@@ -170,10 +306,13 @@ def update_task(task_id, title, description, category):
         return "Error: Please enter a Task ID!", app.get_tasks_display()
     try:
         tid = int(task_id)
-        result = app.update_task(tid, title, description, category)
-        return result, app.get_tasks_display()
     except ValueError:
         return "Error: Invalid Task ID!", app.get_tasks_display()
+    if not app.has_task(tid):
+        return f"Error: Task #{tid} not found!", app.get_tasks_display()
+    result = app.update_task(tid, title, description, category)
+    app.flush()
+    return result, app.get_tasks_display()
 
 
 def delete_task(task_id):
@@ -181,10 +320,13 @@ def delete_task(task_id):
         return "Error: Please enter a Task ID!", app.get_tasks_display()
     try:
         tid = int(task_id)
-        result = app.delete_task(tid)
-        return result, app.get_tasks_display()
     except ValueError:
         return "Error: Invalid Task ID!", app.get_tasks_display()
+    if not app.has_task(tid):
+        return f"Error: Task #{tid} not found!", app.get_tasks_display()
+    result = app.delete_task(tid)
+    app.flush()
+    return result, app.get_tasks_display()
 
 
 def toggle_task(task_id):
@@ -192,10 +334,13 @@ def toggle_task(task_id):
         return "Error: Please enter a Task ID!", app.get_tasks_display()
     try:
         tid = int(task_id)
-        result = app.toggle_complete(tid)
-        return result, app.get_tasks_display()
     except ValueError:
         return "Error: Invalid Task ID!", app.get_tasks_display()
+    if not app.has_task(tid):
+        return f"Error: Task #{tid} not found!", app.get_tasks_display()
+    result = app.toggle_complete(tid)
+    app.flush()
+    return result, app.get_tasks_display()
 
 
 def refresh_tasks():
@@ -219,7 +364,7 @@ with gr.Blocks(title="To-Do App - NED PGD Final Exam", theme=gr.themes.Soft()) a
         with gr.Column(scale=2):
             gr.Markdown("### Task List")
             filter_dropdown = gr.Dropdown(
-                choices=["All"] + CATEGORIES,
+                choices=FILTER_CHOICES,
                 value="All",
                 label="Filter by Category"
             )
@@ -15,18 +15,32 @@ This application demonstrates:
 4. Interactive console interface
 """
 
+import atexit
+import bisect
 import json
+import mmap
 import os
+from contextlib import nullcontext
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 # =============================================================================
 # DATA MODEL
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a single to-do task."""
     id: int
@@ -36,6 +50,29 @@ class Task:
     created_at: str
     completed: bool = False
 
+    def to_dict(self) -> dict:
+        """Convert the task to a plain dict for JSON storage."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "category": self.category,
+            "created_at": self.created_at,
+            "completed": self.completed
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        """Rebuild a task from stored JSON without going through __init__."""
+        task = object.__new__(cls)
+        task.id = data["id"]
+        task.title = data["title"]
+        task.description = data["description"]
+        task.category = data["category"]
+        task.created_at = data["created_at"]
+        task.completed = data.get("completed", False)
+        return task
+
 
 # =============================================================================
 # CONSTANTS
@@ -53,34 +90,88 @@ class TodoApp:
     """Main application class for managing to-do tasks."""
 
     def __init__(self):
-        self.tasks: List[Task] = []
         self.next_id: int = 1
+        # Tasks keyed by ID; insertion order is ID order since IDs only grow
+        self._by_id: Dict[int, Task] = {}
+        self._by_category: Dict[str, List[Task]] = {}
+        self._dirty: bool = False
         self.load_from_file()
 
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks, ordered by ID."""
+        return list(self._by_id.values())
+
     # -------------------------------------------------------------------------
     # PERSISTENCE METHODS
     # -------------------------------------------------------------------------
 
     def save_to_file(self) -> None:
-        """Save all tasks to JSON file."""
+        """Save all tasks to JSON file, replacing it atomically."""
         data = {
             "next_id": self.next_id,
-            "tasks": [asdict(task) for task in self.tasks]
+            "tasks": [task.to_dict() for task in self._by_id.values()]
         }
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(data)
+        else:
+            payload = json.dumps(data, separators=(",", ":")).encode()
+
+        tmp_file = DATA_FILE + ".tmp"
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        # The lock only keeps concurrent processes off the shared temp file.
+        # Each process still writes its own in-memory tasks, so the last
+        # writer wins; closing the lock file releases the lock.
+        lock_file = open(DATA_FILE + ".lock", "a") if fcntl is not None else nullcontext()
+        with lock_file as lock:
+            if lock is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            fd = os.open(tmp_file, flags, 0o644)
+            try:
+                written = 0
+                while written < len(payload):
+                    written += os.write(fd, payload[written:])
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, DATA_FILE)
+
+    def flush(self) -> None:
+        """Write pending changes to the JSON file, if there are any."""
+        if self._dirty:
+            self.save_to_file()
+            self._dirty = False
+
+    def _mark_dirty(self) -> None:
+        """Record that tasks changed and need to be written out."""
+        self._dirty = True
 
     def load_from_file(self) -> None:
         """Load tasks from JSON file if it exists."""
+        tasks: List[Task] = []
         if os.path.exists(DATA_FILE):
             try:
-                with open(DATA_FILE, "r") as f:
-                    data = json.load(f)
-                    self.next_id = data.get("next_id", 1)
-                    self.tasks = [Task(**task) for task in data.get("tasks", [])]
-            except (json.JSONDecodeError, KeyError):
-                self.tasks = []
+                with (
+                    open(DATA_FILE, "rb") as f,
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+                ):
+                    if orjson is not None:
+                        with memoryview(mm) as view:
+                            data = orjson.loads(view)
+                    else:
+                        data = json.loads(mm[:])
+                self.next_id = data.get("next_id", 1)
+                tasks = [Task.from_dict(task) for task in data.get("tasks", [])]
+            # JSONDecodeError is a ValueError, as is mmap's error on an empty file
+            except (ValueError, KeyError):
+                tasks = []
                 self.next_id = 1
+        # Index in ID order even if the file was written in some other order
+        tasks.sort(key=lambda t: t.id)
+        self._by_id = {task.id: task for task in tasks}
+        self._by_category = {}
+        for task in tasks:
+            self._by_category.setdefault(task.category, []).append(task)
 
     # -------------------------------------------------------------------------
     # CRUD OPERATIONS
@@ -93,28 +184,26 @@ class TodoApp:
             title=title,
             description=description,
             category=category,
-            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            created_at=datetime.now().isoformat(sep=" ", timespec="seconds"),
             completed=False
         )
-        self.tasks.append(task)
+        self._by_id[task.id] = task
+        self._by_category.setdefault(task.category, []).append(task)
         self.next_id += 1
-        self.save_to_file()
+        self._mark_dirty()
         return task
 
     def get_all_tasks(self) -> List[Task]:
-        """Get all tasks."""
-        return self.tasks
+        """Get all tasks, ordered by ID."""
+        return list(self._by_id.values())
 
     def get_tasks_by_category(self, category: str) -> List[Task]:
         """Get tasks filtered by category."""
-        return [task for task in self.tasks if task.category == category]
+        return list(self._by_category.get(category, []))
 
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
         """Get a specific task by ID."""
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self._by_id.get(task_id)
 
     def update_task(self, task_id: int, title: str = None,
                     description: str = None, category: str = None) -> bool:
@@ -126,17 +215,17 @@ class TodoApp:
             if description is not None:
                 task.description = description
             if category:
-                task.category = category
-            self.save_to_file()
+                self._set_category(task, category)
+            self._mark_dirty()
             return True
         return False
 
     def delete_task(self, task_id: int) -> bool:
         """Delete a task by ID."""
-        task = self.get_task_by_id(task_id)
+        task = self._by_id.pop(task_id, None)
         if task:
-            self.tasks.remove(task)
-            self.save_to_file()
+            self._by_category[task.category].remove(task)
+            self._mark_dirty()
             return True
         return False
 
@@ -145,10 +234,20 @@ class TodoApp:
         task = self.get_task_by_id(task_id)
         if task:
             task.completed = not task.completed
-            self.save_to_file()
+            self._mark_dirty()
             return True
         return False
 
+    def _set_category(self, task: Task, category: str) -> None:
+        """Change a task's category, keeping the category index in id order."""
+        if category == task.category:
+            return
+        # insort relies on every bucket already being sorted by id, which
+        # load_from_file and add_task guarantee
+        self._by_category[task.category].remove(task)
+        task.category = category
+        bisect.insort(self._by_category.setdefault(category, []), task, key=lambda t: t.id)
+
 
 # =============================================================================
 # CONSOLE INTERFACE
@@ -337,6 +436,7 @@ def handle_toggle_complete(app: TodoApp):
 def main():
     """Main application entry point."""
     app = TodoApp()
+    atexit.register(app.flush)
 
     print_header()
     print("\nWelcome! This is a console-based To-Do application.")
@@ -367,6 +467,8 @@ def main():
             else:
                 print("\nInvalid choice. Please enter a number between 1 and 7.")
 
+            app.flush()
+
         except KeyboardInterrupt:
             print("\n\nExiting application...")
             break